@@ -2,4 +2,4 @@
 
 set -eu
 
-uv run python3 -c 'import pokesprite.pokemon; pokesprite.pokemon.generate_pokemon_sprite_ansi_files()'
+uv run python3 -m pokesprite.pokemon
@@ -1,21 +1,47 @@
-from collections.abc import Iterable
-from itertools import zip_longest
+from functools import lru_cache
 
 import numpy as np
 
 from pokesprite.image import ImageArray
-from pokesprite.image import ImagePixelArray
-from pokesprite.image import ImageRowArray
+from pokesprite.image import MaskArray
+from pokesprite.image import Pixel
 
 ANSI_RESET_CODE = "\033[0m"
+ANSI_RESET_CODE_BYTES = ANSI_RESET_CODE.encode()
+ANSI_FOREGROUND_PREFIX = "\033[38;2;"
+ANSI_BACKGROUND_PREFIX = "\033[48;2;"
+ANSI_PALETTE_FOREGROUND_PREFIX = "\033[38;5;"
+ANSI_PALETTE_BACKGROUND_PREFIX = "\033[48;5;"
+DECIMAL = tuple(str(i) for i in range(256))
 UPPER_BLOCK = "▀"
 LOWER_BLOCK = "▄"
 EMPTY_BLOCK = " "
 SOLID_BLOCK = "██"
 WIDE_EMPTY_BLOCK = "  "
-
-
-def array_to_blocks_art_small(array: ImageArray) -> str:
+VISIBLE_KEY_BIT = np.uint32(1 << 24)
+# flags of the codes emitted by a cell, packed in the low bits of the cell keys
+RESET_FLAG = 0b100
+FOREGROUND_FLAG = 0b010
+BACKGROUND_FLAG = 0b001
+
+# xterm 256 colors palette: a 6x6x6 color cube (16-231) and a grayscale ramp (232-255),
+# the 16 system colors (0-15) are left out since terminals theme them
+PALETTE_OFFSET = 16
+PALETTE_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+PALETTE_COLORS = np.array(
+    [
+        *((r, g, b) for r in PALETTE_CUBE_LEVELS for g in PALETTE_CUBE_LEVELS for b in PALETTE_CUBE_LEVELS),
+        *((v, v, v) for v in range(8, 248, 10)),
+    ],
+    dtype=np.uint8,
+)
+PALETTE_INDEX = {color: PALETTE_OFFSET + i for i, color in enumerate(map(tuple, PALETTE_COLORS.tolist()))}
+
+PixelKeyArray = np.ndarray[tuple[int, int], np.dtype[np.uint32]]
+CellIndexArray = np.ndarray[tuple[int, int], np.dtype[np.intp]]
+
+
+def array_to_blocks_art_small(array: ImageArray, palette: bool = False) -> str:  # noqa: FBT001, FBT002
     """
     Convert a 2D image array into a string of ANSI art using half-block characters.
 
@@ -24,79 +50,278 @@ def array_to_blocks_art_small(array: ImageArray) -> str:
 
     Args:
         array (ImageArray): 2D array of pixels.
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor.
 
     Returns:
         str: ANSI art string representation using half-blocks.
 
     """
-    result = ""
-    for upper_row, lower_row in rows_pair(array):
-        if lower_row is None:
-            lower_row: ImageRowArray | None = np.zeros_like(upper_row)  # noqa: PLW2901
-        for upper_pixel, lower_pixel in zip(upper_row, lower_row, strict=False):
-            result += pixel_pair_to_ansi_block(upper_pixel, lower_pixel)
-        result += ANSI_RESET_CODE + "\n"
-    return result + ANSI_RESET_CODE
+    return join_rows(*blocks_small(array, palette))
+
+
+def array_to_blocks_art_small_bytes(array: ImageArray, palette: bool = False) -> bytes:  # noqa: FBT001, FBT002
+    """
+    Convert a 2D image array into UTF-8 encoded ANSI art using half-block characters.
+
+    Same output as `array_to_blocks_art_small`, ready to be written to a binary stream.
+    Only the unique blocks are encoded, instead of the whole art string.
+
+    Args:
+        array (ImageArray): 2D array of pixels.
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor.
+
+    Returns:
+        bytes: UTF-8 encoded ANSI art using half-blocks.
+
+    """
+    blocks, indices = blocks_small(array, palette)
+    return join_rows_bytes([block.encode() for block in blocks], indices)
 
 
-def array_to_blocks_art_large(array: ImageArray) -> str:
+def array_to_blocks_art_large(array: ImageArray, palette: bool = False) -> str:  # noqa: FBT001, FBT002
     """
     Convert a 2D image array into a string of ANSI art using wide blocks.
 
     Each pixel is represented by either a colored solid block or an empty block,
-    depending on its alpha value. The function iterates over each row and pixel,
-    applying the appropriate ANSI color code for visible pixels.
+    depending on its alpha value.
 
     Args:
         array (ImageArray): 2D array of pixels, where each pixel is a tuple (r, g, b, a).
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor.
 
     Returns:
         str: ANSI art string representation of the image.
 
     """
-    row: ImageRowArray
-    pixel: ImagePixelArray
-    result = ""
-    for row in array:
-        for pixel in row:
-            r, g, b, a = pixel
-            if a == 0:
-                result += WIDE_EMPTY_BLOCK
-            else:
-                result += ansi_color_code(r, g, b) + SOLID_BLOCK
-        result += ANSI_RESET_CODE + "\n"
-    return result + ANSI_RESET_CODE
+    return join_rows(*blocks_large(array, palette))
 
 
-def rows_pair(array: ImageArray) -> Iterable[tuple[ImageRowArray, ImageRowArray | None]]:
+def array_to_blocks_art_large_bytes(array: ImageArray, palette: bool = False) -> bytes:  # noqa: FBT001, FBT002
     """
-    Group the input array of image rows into pairs.
+    Convert a 2D image array into UTF-8 encoded ANSI art using wide blocks.
+
+    Same output as `array_to_blocks_art_large`, ready to be written to a binary stream.
+    Only the unique blocks are encoded, instead of the whole art string.
 
     Args:
-        array (ImageArray): An iterable of image row arrays.
+        array (ImageArray): 2D array of pixels, where each pixel is a tuple (r, g, b, a).
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor.
 
     Returns:
-        Iterable[tuple[ImageRowArray, ImageRowArray | None]]:
-            An iterable of tuples,
-            each containing two consecutive image row arrays.
+        bytes: UTF-8 encoded ANSI art using wide blocks.
+
+    """
+    blocks, indices = blocks_large(array, palette)
+    return join_rows_bytes([block.encode() for block in blocks], indices)
+
+
+def blocks_small(array: ImageArray, palette: bool = False) -> tuple[list[str], CellIndexArray]:  # noqa: FBT001, FBT002
+    """
+    Render the unique half-block cells of an image array.
 
     Notes:
-        - If the number of rows is odd, the last row will be omitted.
-        - Uses zip_longest and iter to efficiently pair rows without creating intermediate lists.
+        - If the number of rows is odd, the last row is paired with a transparent row.
+        - Sprites have few distinct pixel pairs, so each unique pair is rendered once
+          and the cells are looked up by index instead of formatted per pixel.
+        - Color codes are only emitted when they differ from the colors already set by the
+          previous cells of the row, and colors are only reset when a cell without background
+          follows a cell with one. A cell is unique by its pixel pair and the codes it emits.
+
+    Args:
+        array (ImageArray): 2D array of pixels.
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor.
+
+    Returns:
+        tuple[list[str], CellIndexArray]:
+            The rendered unique blocks, and the index of the block of each cell.
 
     """
-    return zip_longest(*([iter(array)] * 2), fillvalue=None)  # pyright: ignore[reportReturnType]
+    if palette:
+        array = to_palette_colors(array)
+    pixels = pixel_keys(array)
+    height, width = pixels.shape
+    if height % 2 != 0:
+        pixels = np.concatenate([pixels, np.zeros((1, width), dtype=pixels.dtype)])
+        height += 1
+    pairs = pixels.reshape(height // 2, 2, width).astype(np.uint64)
+    upper, lower = pairs[:, 0], pairs[:, 1]
+    foreground = np.where(upper != 0, upper, lower)
+    background = np.where(upper != 0, lower, 0)
+    has_background = background != 0
+    needs_reset = np.zeros_like(has_background)
+    needs_reset[:, 1:] = has_background[:, :-1] & ~has_background[:, 1:]
+    # a reset clears the foreground, transparent cells keep the previous one
+    previous_foreground = previous_in_row(foreground, (foreground != 0) | needs_reset)
+    previous_foreground[needs_reset] = 0
+    sets_foreground = (foreground != 0) & (foreground != previous_foreground)
+    sets_background = has_background & (
+        background != previous_in_row(background, has_background | needs_reset)
+    )
+    flags = needs_reset * RESET_FLAG | sets_foreground * FOREGROUND_FLAG | sets_background * BACKGROUND_FLAG
+    keys = (upper << 32 | lower) << 3 | flags.astype(np.uint64)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    blocks: list[str] = []
+    for key in unique_keys.tolist():
+        block = pixel_pair_to_ansi_block(
+            unpack_pixel_key(key >> 35),
+            unpack_pixel_key(key >> 3 & 0xFFFFFFFF),
+            set_foreground=bool(key & FOREGROUND_FLAG),
+            set_background=bool(key & BACKGROUND_FLAG),
+            palette=palette,
+        )
+        blocks.append(ANSI_RESET_CODE + block if key & RESET_FLAG else block)
+    return blocks, inverse.reshape(keys.shape)
+
+
+def blocks_large(array: ImageArray, palette: bool = False) -> tuple[list[str], CellIndexArray]:  # noqa: FBT001, FBT002
+    """
+    Render the unique wide-block cells of an image array.
+
+    Each unique pixel is rendered once, applying the appropriate ANSI color code for visible pixels,
+    and the cells are looked up by index instead of formatted per pixel.
+    The color code is only emitted when it differs from the color of the previous visible pixel of the row.
 
+    Args:
+        array (ImageArray): 2D array of pixels.
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor.
 
-def pixel_pair_to_ansi_block(upper_pixel: ImagePixelArray, lower_pixel: ImagePixelArray) -> str:
+    Returns:
+        tuple[list[str], CellIndexArray]:
+            The rendered unique blocks, and the index of the block of each cell.
+
+    """
+    if palette:
+        array = to_palette_colors(array)
+    pixels = pixel_keys(array)
+    visible = pixels != 0
+    sets_foreground = visible & (pixels != previous_in_row(pixels, visible))
+    keys = pixels.astype(np.uint64) << 1 | sets_foreground.astype(np.uint64)
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    foreground_code = ansi_palette_foreground_code if palette else ansi_foreground_code
+    blocks: list[str] = []
+    for key in unique_keys.tolist():
+        r, g, b, a = unpack_pixel_key(key >> 1)
+        if a == 0:
+            blocks.append(WIDE_EMPTY_BLOCK)
+        elif key & 1:
+            blocks.append(foreground_code(r, g, b) + SOLID_BLOCK)
+        else:
+            blocks.append(SOLID_BLOCK)
+    return blocks, inverse.reshape(keys.shape)
+
+
+def previous_in_row[T: np.generic](
+    values: np.ndarray[tuple[int, int], np.dtype[T]],
+    defined: MaskArray,
+) -> np.ndarray[tuple[int, int], np.dtype[T]]:
+    """
+    For each cell, find the value of the last defined cell before it in the same row.
+
+    Args:
+        values (np.ndarray): 2D array of values.
+        defined (MaskArray): Mask of the cells whose value is carried over to the following cells.
+
+    Returns:
+        np.ndarray: 2D array of the carried values, 0 where no cell before it in the row is defined.
+
+    """
+    height, width = values.shape
+    # 1-based column of the last defined cell up to each cell, 0 for none
+    columns = np.maximum.accumulate(np.where(defined, np.arange(1, width + 1), 0), axis=1)
+    padded = np.concatenate([np.zeros((height, 1), dtype=values.dtype), values], axis=1)
+    carried = np.take_along_axis(padded, columns, axis=1)
+    previous = np.zeros_like(values)
+    previous[:, 1:] = carried[:, :-1]
+    return previous
+
+
+def pixel_keys(array: ImageArray) -> PixelKeyArray:
+    """
+    Pack each pixel into a single integer key.
+
+    Visible pixels are packed as 0x1RRGGBB, every transparent pixel maps to 0,
+    regardless of its color, since its color is never rendered.
+
+    Args:
+        array (ImageArray): Array of pixels with the RGBA values in the last axis.
+
+    Returns:
+        PixelKeyArray: Array of packed pixel keys, with the last axis removed.
+
+    """
+    r = array[..., 0].astype(np.uint32)
+    g = array[..., 1].astype(np.uint32)
+    b = array[..., 2].astype(np.uint32)
+    keys = VISIBLE_KEY_BIT | r << 16 | g << 8 | b
+    return np.where(array[..., 3] != 0, keys, np.uint32(0))
+
+
+def unpack_pixel_key(key: int) -> Pixel:
+    """
+    Unpack a key created by `pixel_keys` back into a pixel.
+
+    Args:
+        key (int): Packed pixel key.
+
+    Returns:
+        Pixel: Tuple (r, g, b, a), alpha is either 0 or 255.
+
+    """
+    a = 255 if key & VISIBLE_KEY_BIT else 0
+    return (key >> 16 & 0xFF, key >> 8 & 0xFF, key & 0xFF, a)
+
+
+def join_rows(blocks: list[str], indices: CellIndexArray) -> str:
+    """
+    Assemble the final ANSI art string from rendered blocks.
+
+    Args:
+        blocks (list[str]): Rendered ANSI string for each unique cell.
+        indices (CellIndexArray): 2D array of indices into `blocks`, one per cell.
+
+    Returns:
+        str: ANSI art string, with every line terminated by a reset code.
+
+    """
+    lines = ["".join(map(blocks.__getitem__, row)) for row in indices.tolist()]  # pyright: ignore[reportAny]
+    return "".join(line + ANSI_RESET_CODE + "\n" for line in lines) + ANSI_RESET_CODE
+
+
+def join_rows_bytes(blocks: list[bytes], indices: CellIndexArray) -> bytes:
+    """
+    Assemble the final ANSI art bytes from encoded blocks.
+
+    Args:
+        blocks (list[bytes]): Encoded ANSI bytes for each unique cell.
+        indices (CellIndexArray): 2D array of indices into `blocks`, one per cell.
+
+    Returns:
+        bytes: ANSI art bytes, with every line terminated by a reset code.
+
+    """
+    lines = [b"".join(map(blocks.__getitem__, row)) for row in indices.tolist()]  # pyright: ignore[reportAny]
+    return b"".join(line + ANSI_RESET_CODE_BYTES + b"\n" for line in lines) + ANSI_RESET_CODE_BYTES
+
+
+def pixel_pair_to_ansi_block(
+    upper_pixel: Pixel,
+    lower_pixel: Pixel,
+    set_foreground: bool = True,  # noqa: FBT001, FBT002
+    set_background: bool = True,  # noqa: FBT001, FBT002
+    palette: bool = False,  # noqa: FBT001, FBT002
+) -> str:
     """
     Convert a pair of image pixels (upper and lower) into a string representing an ANSI block character.
 
-    With appropriate foreground and background colors.
+    With appropriate foreground and background colors. Colors are not reset before the block,
+    a background color set by a previous block must be reset by the caller.
 
     Args:
-        upper_pixel (ImagePixelArray): RGBA values for the upper pixel.
-        lower_pixel (ImagePixelArray): RGBA values for the lower pixel.
+        upper_pixel (Pixel): RGBA values for the upper pixel.
+        lower_pixel (Pixel): RGBA values for the lower pixel.
+        set_foreground (bool, optional): If False, the foreground color is already set and is not emitted.
+        set_background (bool, optional): If False, the background color is already set and is not emitted.
+        palette (bool, optional): If True, the pixels have palette colors, emitted as 256 colors codes.
 
     Returns:
         str: ANSI escape code string representing the colored block.
@@ -105,34 +330,158 @@ def pixel_pair_to_ansi_block(upper_pixel: ImagePixelArray, lower_pixel: ImagePix
         ValueError: If neither pixel is visible (alpha == 0 for both).
 
     """
+    foreground_code = ansi_palette_foreground_code if palette else ansi_foreground_code
+    background_code = ansi_palette_background_code if palette else ansi_background_code
     upper_pixel_r, upper_pixel_g, uppper_pixel_b, upper_pixel_a = upper_pixel
     lower_pixel_r, lower_pixel_g, lower_pixel_b, lower_pixel_a = lower_pixel
     if upper_pixel_a == 0 and lower_pixel_a == 0:
-        return ANSI_RESET_CODE + EMPTY_BLOCK
+        return EMPTY_BLOCK
     if upper_pixel_a != 0:
-        code1 = ansi_color_code(upper_pixel_r, upper_pixel_g, uppper_pixel_b, background=False)
+        code1 = ""
+        if set_foreground:
+            code1 = foreground_code(upper_pixel_r, upper_pixel_g, uppper_pixel_b)
         code2 = ""
-        if lower_pixel_a != 0:
-            code2 = ansi_color_code(lower_pixel_r, lower_pixel_g, lower_pixel_b, background=True)
-        return ANSI_RESET_CODE + code1 + code2 + UPPER_BLOCK
+        if lower_pixel_a != 0 and set_background:
+            code2 = background_code(lower_pixel_r, lower_pixel_g, lower_pixel_b)
+        return code1 + code2 + UPPER_BLOCK
     if lower_pixel_a != 0:
-        code2 = ansi_color_code(lower_pixel_r, lower_pixel_g, lower_pixel_b, background=False)
-        return ANSI_RESET_CODE + code2 + LOWER_BLOCK
+        code2 = ""
+        if set_foreground:
+            code2 = foreground_code(lower_pixel_r, lower_pixel_g, lower_pixel_b)
+        return code2 + LOWER_BLOCK
     raise ValueError
 
 
-def ansi_color_code(r: np.uint8, g: np.uint8, b: np.uint8, background: bool = False) -> str:  # noqa: FBT001, FBT002
+def ansi_color_code(r: int, g: int, b: int, background: bool = False) -> str:  # noqa: FBT001, FBT002
     """
     Return an ANSI escape code string for setting the foreground or background color in the terminal.
 
+    Renderers call `ansi_foreground_code` / `ansi_background_code` directly.
+
     Args:
-        r (np.uint8): Red component (0-255).
-        g (np.uint8): Green component (0-255).
-        b (np.uint8): Blue component (0-255).
+        r (int): Red component (0-255).
+        g (int): Green component (0-255).
+        b (int): Blue component (0-255).
         background (bool, optional): If True, sets background color; otherwise, sets foreground color.
 
     Returns:
         str: ANSI escape code for the specified color.
 
     """
-    return f"\033[{48 if background else 38};2;{r};{g};{b}m"
+    return ansi_background_code(r, g, b) if background else ansi_foreground_code(r, g, b)
+
+
+@lru_cache(maxsize=1024)
+def ansi_foreground_code(r: int, g: int, b: int) -> str:
+    """
+    Return an ANSI escape code string for setting the foreground color in the terminal.
+
+    Results are memoized, sprites reuse a small palette across many pixels.
+    Components are looked up in a table of decimal strings instead of being formatted.
+
+    Args:
+        r (int): Red component (0-255).
+        g (int): Green component (0-255).
+        b (int): Blue component (0-255).
+
+    Returns:
+        str: ANSI escape code for the specified foreground color.
+
+    """
+    return ANSI_FOREGROUND_PREFIX + DECIMAL[r] + ";" + DECIMAL[g] + ";" + DECIMAL[b] + "m"
+
+
+@lru_cache(maxsize=1024)
+def ansi_background_code(r: int, g: int, b: int) -> str:
+    """
+    Return an ANSI escape code string for setting the background color in the terminal.
+
+    Results are memoized, sprites reuse a small palette across many pixels.
+    Components are looked up in a table of decimal strings instead of being formatted.
+
+    Args:
+        r (int): Red component (0-255).
+        g (int): Green component (0-255).
+        b (int): Blue component (0-255).
+
+    Returns:
+        str: ANSI escape code for the specified background color.
+
+    """
+    return ANSI_BACKGROUND_PREFIX + DECIMAL[r] + ";" + DECIMAL[g] + ";" + DECIMAL[b] + "m"
+
+
+@lru_cache(maxsize=1024)
+def ansi_palette_foreground_code(r: int, g: int, b: int) -> str:
+    """
+    Return a 256 colors ANSI escape code string for setting the foreground color to a color of the palette.
+
+    Args:
+        r (int): Red component (0-255).
+        g (int): Green component (0-255).
+        b (int): Blue component (0-255).
+
+    Returns:
+        str: ANSI escape code for the palette index of the specified foreground color.
+
+    Raises:
+        KeyError: If the color is not in the palette, see `to_palette_colors`.
+
+    """
+    return ANSI_PALETTE_FOREGROUND_PREFIX + DECIMAL[PALETTE_INDEX[r, g, b]] + "m"
+
+
+@lru_cache(maxsize=1024)
+def ansi_palette_background_code(r: int, g: int, b: int) -> str:
+    """
+    Return a 256 colors ANSI escape code string for setting the background color to a color of the palette.
+
+    Args:
+        r (int): Red component (0-255).
+        g (int): Green component (0-255).
+        b (int): Blue component (0-255).
+
+    Returns:
+        str: ANSI escape code for the palette index of the specified background color.
+
+    Raises:
+        KeyError: If the color is not in the palette, see `to_palette_colors`.
+
+    """
+    return ANSI_PALETTE_BACKGROUND_PREFIX + DECIMAL[PALETTE_INDEX[r, g, b]] + "m"
+
+
+def to_palette_colors(array: ImageArray) -> ImageArray:
+    """
+    Replace the color of each pixel with the nearest color of the 256 colors palette.
+
+    Args:
+        array (ImageArray): Array of pixels with the RGBA values in the last axis.
+
+    Returns:
+        ImageArray: A copy of the array with palette colors, alpha is unchanged.
+
+    """
+    quantized = array.copy()
+    quantized[..., :3] = nearest_palette_colors(array[..., :3])
+    return quantized
+
+
+def nearest_palette_colors[T: np.integer](
+    rgb: np.ndarray[tuple[int, ...], np.dtype[T]],
+) -> np.ndarray[tuple[int, ...], np.dtype[np.uint8]]:
+    """
+    Find the nearest color of the 256 colors palette for each color.
+
+    Distances are computed once per unique color, in RGB space.
+
+    Args:
+        rgb (np.ndarray): Array of colors with the RGB values in the last axis.
+
+    Returns:
+        np.ndarray: Array of palette colors, with the same shape.
+
+    """
+    colors, inverse = np.unique(rgb.reshape(-1, 3), axis=0, return_inverse=True)
+    distances = np.square(colors[:, None, :].astype(np.int32) - PALETTE_COLORS.astype(np.int32)).sum(axis=-1)
+    return PALETTE_COLORS[distances.argmin(axis=1)][inverse.reshape(rgb.shape[:-1])]
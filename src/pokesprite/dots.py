@@ -1,20 +1,27 @@
 import numpy as np
 
+from pokesprite.ansi import ansi_foreground_code
+from pokesprite.ansi import ansi_palette_foreground_code
+from pokesprite.ansi import nearest_palette_colors
 from pokesprite.image import ImageArray
 
 ANSI_RESET_CODE = "\033[0m"
 
 TRANSPARENCY_THRESHOLD = 127
 
+DotsColorArray = np.ndarray[tuple[int, int, int], np.dtype[np.uint16]]
+DotsBitsArray = np.ndarray[tuple[int, int], np.dtype[np.uint8]]
+
 WEIGHTS = np.array(
     [
-        [[1, 1, 1], [1, 1, 1]],
-        [[2, 2, 2], [2, 2, 2]],
-        [[2, 2, 2], [2, 2, 2]],
-        [[1, 1, 1], [1, 1, 1]],
+        [1, 1],
+        [2, 2],
+        [2, 2],
+        [1, 1],
     ],
-    dtype=np.uint8,
+    dtype=np.uint16,
 )
+WEIGHTS_SUM = int(WEIGHTS.sum())
 
 
 # 0x2800 + bits
@@ -29,39 +36,82 @@ DOTS = [
     (1, 3),  # 0x0080
 ]
 
+# bit of each dot, indexed as [dy, dx]
+DOT_BITS = np.array(
+    [[1 << DOTS.index((dx, dy)) for dx in range(2)] for dy in range(4)],
+    dtype=np.uint8,
+)
+
+BRAILLE = [chr(0x2800 + bits) for bits in range(256)]
 
-def array_to_dots_art(array: ImageArray, threshold: int = TRANSPARENCY_THRESHOLD) -> str:
+
+def array_to_dots_art(
+    array: ImageArray,
+    threshold: int = TRANSPARENCY_THRESHOLD,
+    palette: bool = False,  # noqa: FBT001, FBT002
+) -> str:
     """
     Convert an image array to colored braille art for terminal display.
 
     Each braille character represents a 2x4 block of pixels.
     The function uses the alpha channel to determine transparency and averages the RGB values for each block.
     Only pixels above the transparency threshold are considered visible.
+    The color code is only emitted when it differs from the color of the previous character of the row.
 
     Args:
         array (ImageArray): The input image array with shape (height, width, 4) (RGBA).
         threshold (int, optional): Alpha threshold for transparency. Defaults to TRANSPARENCY_THRESHOLD.
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor.
 
     Returns:
         str: A string containing ANSI escape codes and braille characters representing the image.
 
     """
-    alpha_channel = array[:, :, 3]
-    mask = alpha_channel > threshold
-    rgb_array = array[:, :, :3]
-    height, width = mask.shape  # pyright: ignore[reportAny]
-    result = ""
-    for y in range(0, height // 4 * 4, 4):  # pyright: ignore[reportAny]
-        for x in range(0, width // 2 * 2, 2):  # pyright: ignore[reportAny]
-            r, g, b = np.average(  # pyright: ignore[reportAny]
-                rgb_array[y : y + 4, x : x + 2],
-                axis=(0, 1),
-                weights=WEIGHTS,
-            ).astype(int)
-            block = 0x2800
-            for i, (dx, dy) in enumerate(DOTS):
-                if mask[y + dy, x + dx]:
-                    block |= 1 << i
-            result += f"\033[38;2;{r};{g};{b}m{chr(block)}"
-        result += ANSI_RESET_CODE + "\n"
-    return result + ANSI_RESET_CODE
+    rgb, bits = array_to_dots(array, threshold)
+    foreground_code = ansi_foreground_code
+    if palette:
+        rgb = nearest_palette_colors(rgb)
+        foreground_code = ansi_palette_foreground_code
+    parts: list[str] = []
+    for rgb_row, bits_row in zip(rgb.tolist(), bits.tolist(), strict=True):  # pyright: ignore[reportAny]
+        previous = None
+        for color, c in zip(rgb_row, bits_row, strict=True):  # pyright: ignore[reportAny]
+            # the color code is only emitted when it differs from the previous cell
+            if color != previous:
+                parts.append(foreground_code(*color))  # pyright: ignore[reportAny]
+                previous = color  # pyright: ignore[reportAny]
+            parts.append(BRAILLE[c])  # pyright: ignore[reportAny]
+        parts.append(ANSI_RESET_CODE + "\n")
+    parts.append(ANSI_RESET_CODE)
+    return "".join(parts)
+
+
+def array_to_dots(
+    array: ImageArray,
+    threshold: int = TRANSPARENCY_THRESHOLD,
+) -> tuple[DotsColorArray, DotsBitsArray]:
+    """
+    Compute the color and the dots of each braille character of an image array.
+
+    The image is reshaped into 2x4 blocks, so the averages and dots are computed
+    for all blocks at once. Trailing rows and columns that do not fill a block are dropped.
+    Averages use integer math, rounding down.
+
+    Args:
+        array (ImageArray): The input image array with shape (height, width, 4) (RGBA).
+        threshold (int, optional): Alpha threshold for transparency. Defaults to TRANSPARENCY_THRESHOLD.
+
+    Returns:
+        tuple[DotsColorArray, DotsBitsArray]:
+            The weighted average RGB of each block, with shape (height // 4, width // 2, 3),
+            and the dots bits of each block, with shape (height // 4, width // 2).
+
+    """
+    height, width, _ = array.shape
+    array = array[: height // 4 * 4, : width // 2 * 2]
+    blocks = array.reshape(height // 4, 4, width // 2, 2, 4)
+    mask = blocks[:, :, :, :, 3] > threshold
+    weighted = blocks[:, :, :, :, :3] * WEIGHTS[:, None, :, None]
+    rgb = np.sum(weighted, axis=(1, 3), dtype=np.uint16) // WEIGHTS_SUM
+    bits = np.sum(mask * DOT_BITS[:, None, :], axis=(1, 3), dtype=np.uint8)
+    return rgb, bits
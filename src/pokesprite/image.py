@@ -1,15 +1,21 @@
+from functools import lru_cache
+from io import BytesIO
 from typing import IO
 
 import numpy as np
 from PIL import Image
 
 TRANSPARENCY_THRESHOLD = 128
+# RGB bytes of a RGBA pixel viewed as uint32, independent of byte order
+RGB_BITS = np.array([255, 255, 255, 0], dtype=np.uint8).view(np.uint32)[0]
 
 ImageArray = np.ndarray[tuple[int, int, int], np.dtype[np.uint8]]
 ImageRowArray = np.ndarray[tuple[int, int], np.dtype[np.uint8]]
 ImagePixelArray = np.ndarray[tuple[int], np.dtype[np.uint8]]
 Color = tuple[int, int, int]
+Pixel = tuple[int, int, int, int]
 Box = tuple[int, int, int, int]
+MaskArray = np.ndarray[tuple[int, int], np.dtype[np.bool_]]
 
 
 def get_image_array(
@@ -17,97 +23,201 @@ def get_image_array(
     resize_factor: int | None = None,
     box_area: Box | None = None,
     transparency_color: Color | None = None,
+    quantize: int | None = None,
 ) -> ImageArray:
     """
     Load and process an image from a byte buffer.
 
     This function performs several operations:
-    - Loads the image from the provided byte buffer.
-    - Converts the image to RGBA format.
+    - Loads the image from the provided byte buffer, decoding it once per content.
+    - Converts the image to RGBA format, if it is not already.
     - Optionally crops the image to the specified box area.
     - Optionally resizes the image by the given resize_factor.
-    - Optionally sets a specific color as transparent.
-    - Fixes the alpha channel of the image.
+    - Optionally reduces the image to the given number of colors.
+    - Finds the visible pixels, optionally setting a specific color as transparent.
     - Trims transparent edges from the image.
+    - Fixes the alpha channel of the trimmed image.
 
     Args:
         buf (IO[bytes]): Buffer containing image data in bytes.
         resize_factor (int | None): Optional factor to resize the image dimensions.
         box_area (Box | None): Optional box area (left, upper, right, lower) to crop the image.
         transparency_color (Color | None): Optional RGB color to set as transparent.
+        quantize (int | None): Optional number of colors to reduce the image to.
 
     Returns:
         ImageArray: The processed image as a NumPy array.
 
     """
-    image = Image.open(buf).convert("RGBA")
+    array = np.asarray(load_image(buf, resize_factor=resize_factor, box_area=box_area, quantize=quantize))
+    visible = visible_mask(array, transparency_color=transparency_color)
+    return trim_array(array, visible)
+
+
+def load_image(
+    buf: IO[bytes],
+    resize_factor: int | None = None,
+    box_area: Box | None = None,
+    quantize: int | None = None,
+) -> Image.Image:
+    """
+    Load a RGBA image from a byte buffer, optionally cropped, resized and quantized.
+
+    Quantizing collapses near-identical colors (e.g. anti-aliased fringes), so the art
+    has fewer distinct colors to render and emits fewer color codes.
+    Only the RGB channels are quantized, the alpha channel is kept as is.
+
+    Args:
+        buf (IO[bytes]): Buffer containing image data in bytes, read from the start.
+        resize_factor (int | None): Optional factor to resize the image dimensions.
+        box_area (Box | None): Optional box area (left, upper, right, lower) to crop the image.
+        quantize (int | None): Optional number of colors to reduce the image to, after resizing.
+
+    Returns:
+        Image.Image: The loaded image, shared with other callers if it was not cropped, resized or quantized.
+
+    """
+    _ = buf.seek(0)
+    image = decode_image(buf.read())
     if box_area is not None:
         image = image.crop(box_area)
     if resize_factor is not None:
         size = (image.width * resize_factor, image.height * resize_factor)
         image = image.resize(size, resample=Image.Resampling.HAMMING)
-    array = np.array(image)
-    if transparency_color is not None:
-        array = set_transparent_color(array, color=transparency_color)
-    array = fix_alpha_channel(array)
-    return trim_array(array)
+    if quantize is not None:
+        # only the colors are quantized: quantizing the alpha channel too would merge
+        # visible pixels into transparent palette entries, so the original alpha is put back
+        quantized = image.convert("RGB").quantize(colors=quantize, method=Image.Quantize.FASTOCTREE)
+        quantized = quantized.convert("RGBA")
+        quantized.putalpha(image.getchannel("A"))
+        image = quantized
+    return image
+
+
+@lru_cache(maxsize=8)
+def decode_image(data: bytes) -> Image.Image:
+    """
+    Decode image data into a RGBA image.
 
+    Results are memoized by content, so the same image rendered with different options
+    (e.g. crop areas or resize factors) is only decoded once.
+    The returned image is shared and must not be modified in place.
 
-def set_transparent_color(array: ImageArray, color: Color) -> ImageArray:
+    Args:
+        data (bytes): Encoded image data.
+
+    Returns:
+        Image.Image: The decoded image, converted to RGBA format if it is not already.
+
+    """
+    image = Image.open(BytesIO(data))
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    _ = image.load()
+    return image
+
+
+def visible_mask(
+    array: ImageArray,
+    transparency_color: Color | None = None,
+    threshold: int = TRANSPARENCY_THRESHOLD,
+) -> MaskArray:
     """
-    Set the alpha channel to zero for all pixels in the image array that match the given RGB color.
+    Find the pixels with alpha above threshold that do not match the transparency color.
 
     Args:
         array (ImageArray): Input image array with shape (H, W, 4).
-        color (tuple[int, int, int]): RGB color to be made transparent.
+        transparency_color (Color | None): Optional RGB color to be made transparent.
+        threshold (int): Alpha threshold for transparency.
 
     Returns:
-        ImageArray: Modified image array with specified color made transparent.
+        MaskArray: Mask of the visible pixels, with shape (H, W).
 
     """
-    rgb = array[:, :, :3]
-    mask = np.all(rgb == color, axis=-1)  # pyright: ignore[reportAny]
-    array[mask, 3] = 0
-    return array
+    visible = array[..., 3] >= threshold
+    if transparency_color is not None:
+        visible &= ~color_mask(array, transparency_color)
+    return visible
 
 
-def fix_alpha_channel(array: ImageArray, threshold: int = TRANSPARENCY_THRESHOLD) -> ImageArray:
+def fix_alpha_channel(array: ImageArray, visible: MaskArray) -> None:
     """
-    Set alpha to 0 if below threshold, 255 if above.
+    Set alpha to 255 for visible pixels, 0 otherwise, in place.
+
+    Args:
+        array (ImageArray): Input image array with shape (H, W, 4), modified in place.
+        visible (MaskArray): Mask of the visible pixels, with shape (H, W).
+
+    Returns:
+        None
+
+    """
+    _ = np.multiply(visible, np.uint8(255), out=array[:, :, 3])
+
+
+def color_mask(array: ImageArray, color: Color) -> MaskArray:
+    """
+    Find the pixels in the image array that match the given RGB color, ignoring alpha.
+
+    Each RGBA pixel is viewed as a single uint32, so the match is one masked integer
+    comparison per pixel instead of one comparison per channel. Arrays whose channels
+    are not contiguous fall back to comparing each channel.
 
     Args:
         array (ImageArray): Input image array with shape (H, W, 4).
-        threshold (int): Alpha threshold for transparency.
+        color (Color): RGB color to match.
 
     Returns:
-        ImageArray: Modified image array with fixed alpha channel.
+        MaskArray: Mask of the matching pixels, with shape (H, W).
 
     """
-    alpha = array[:, :, 3]
-    mask = alpha < threshold
-    array[:, :, 3] = np.where(mask, 0, 255)
+    if array.strides[-1] != array.itemsize:
+        # channels are not contiguous and can't be viewed as uint32, compare each channel
+        r, g, b = color
+        return (array[..., 0] == r) & (array[..., 1] == g) & (array[..., 2] == b)
+    pixels = array.view(np.uint32)[..., 0]
+    target = np.array([*color, 0], dtype=np.uint8).view(np.uint32)[0]
+    return (pixels & RGB_BITS) == target
+
+
+def trim_array(array: ImageArray, visible: MaskArray) -> ImageArray:
+    """
+    Crops image to bounding box of the visible pixels, and fixes its alpha channel.
+
+    Args:
+        array (ImageArray): Input image array with shape (H, W, 4), not modified, may be read-only.
+        visible (MaskArray): Mask of the visible pixels, with shape (H, W).
+
+    Returns:
+        ImageArray: Cropped copy of the image array, with alpha set to 0 or 255.
+
+    """
+    left, upper, right, lower = bounding_box(visible)
+    array = array[upper:lower, left:right].copy()
+    fix_alpha_channel(array, visible[upper:lower, left:right])
     return array
 
 
-def trim_array(array: ImageArray, threshold: int = TRANSPARENCY_THRESHOLD) -> ImageArray:
+def bounding_box(mask: MaskArray) -> Box:
     """
-    Crops image to bounding box of pixels above alpha threshold.
+    Find the bounding box of the pixels set in the mask.
+
+    The bounding box is found from the row and column projections of the mask,
+    an empty mask has an empty bounding box.
 
     Args:
-        array (ImageArray): Input image array with shape (H, W, 4).
-        threshold (int): Minimum alpha value to consider a pixel as non-transparent.
+        mask (MaskArray): Mask of the pixels to keep, with shape (H, W).
 
     Returns:
-        ImageArray: Cropped image array.
-
-    """
-    alpha = array[:, :, 3]
-    mask = alpha > threshold
-    ys, xs = np.where(mask)
-    y_min, y_max = ys.min(), ys.max()  # pyright: ignore[reportAny]
-    x_min, x_max = xs.min(), xs.max()  # pyright: ignore[reportAny]
-    upper = max(y_min, 0)  # pyright: ignore[reportAny]
-    left = max(x_min, 0)  # pyright: ignore[reportAny]
-    lower = min(array.shape[0], y_max) + 1  # pyright: ignore[reportAny]
-    right = min(array.shape[1], x_max) + 1  # pyright: ignore[reportAny]
-    return array[upper:lower, left:right]
+        Box: The bounding box (left, upper, right, lower), right and lower are exclusive.
+
+    """
+    rows = mask.any(axis=1)
+    cols = mask.any(axis=0)
+    if not rows.any():
+        return (0, 0, 0, 0)
+    upper = int(np.argmax(rows))
+    lower = len(rows) - int(np.argmax(rows[::-1]))
+    left = int(np.argmax(cols))
+    right = len(cols) - int(np.argmax(cols[::-1]))
+    return (left, upper, right, lower)
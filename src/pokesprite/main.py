@@ -1,87 +1,36 @@
 import sys
-from argparse import ArgumentParser
 from dataclasses import dataclass
-from io import BytesIO
+from functools import lru_cache
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Literal
 
-from pokesprite.ansi import array_to_blocks_art_large
-from pokesprite.ansi import array_to_blocks_art_small
-from pokesprite.dots import array_to_dots_art
-from pokesprite.image import Box
-from pokesprite.image import Color
-from pokesprite.image import get_image_array
 from pokesprite.pokemon import show_pokemon_list
 from pokesprite.pokemon import show_pokemon_sprite
 from pokesprite.pokemon import show_random_pokemon_sprite
 
-argparser = ArgumentParser(
-    prog="pokesprite",
-    description="Generate ANSI art from Pokémon sprites.",
-    usage="%(prog)s [options]",
-)
-_ = argparser.add_argument(
-    "--filename",
-    action="extend",
-    nargs="+",
-    type=str,
-    help="Image files to convert to ansi art (e.g. 'image.png').",
-    dest="filenames",
-)
-_ = argparser.add_argument(
-    "--style",
-    action="store",
-    default="blocks",
-    type=str,
-    choices=["blocks", "dots"],
-    help="art style to use: 'blocks' (default) or 'dots'.",
-)
-_ = argparser.add_argument(
-    "--box-area",
-    action="store",
-    type=str,
-    help="Crop the image using the given left, upper, right, and lower pixel coordinates (format: LxUxRxD).",
-)
-_ = argparser.add_argument(
-    "--transparency-color-hex",
-    action="store",
-    type=str,
-    help="Set a specific RGB color as transparent in the image (format: AABBCC).",
-)
-_ = argparser.add_argument(
-    "--large",
-    action="store_true",
-    help="Display the image in large ANSI art (default is small, only valid for blocks style).",
-)
-_ = argparser.add_argument(
-    "--name",
-    action="store",
-    type=str,
-    help="Name of the Pokémon to display (e.g. 'ampharos' or 'ampharos-mega').",
-)
-_ = argparser.add_argument(
-    "--random",
-    action="store_true",
-    help="Display a random Pokémon.",
-)
-_ = argparser.add_argument(
-    "--list",
-    action="store_true",
-    help="List all available Pokémon forms.",
-)
-_ = argparser.add_argument(
-    "--shiny",
-    action="store_true",
-    help="Display the shiny version of the Pokémon (only valid with --name or --random).",
-)
-_ = argparser.add_argument(
-    "--show-name",
-    action="store_true",
-    help="Show the name of the random Pokémon.",
-)
-
-
-@dataclass()
+# the image stack (numpy, PIL) is imported by the functions that render images,
+# so showing a precomputed Pokémon sprite does not pay for importing it
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+    from pokesprite.image import Box
+    from pokesprite.image import Color
+    from pokesprite.image import ImageArray
+
+# flags accepted by `parse_args_fast`, mapped to their `Namespace` attribute
+FAST_PATH_FLAGS = {
+    "--random": "random",
+    "--shiny": "shiny",
+    "--large": "large",
+    "--show-name": "show_name",
+}
+# the palette of a quantized image holds at most 256 colors
+QUANTIZE_MAX_COLORS = 256
+
+
+@dataclass(slots=True)
 class Namespace:
     """
     Represents a namespace for command-line args.
@@ -92,6 +41,8 @@ class Namespace:
         box_area (str | None): Box area to crop the image.
         transparency_color_hex (str | None): Hex color code to mark as transparency color.
         large (bool): Whether to display in large ANSI art.
+        quantize (int | None): Number of colors to reduce the image to.
+        palette (bool): Whether to use the 256 colors palette instead of truecolor.
         name (str | None): Whether to select a Pokémon sprite.
         random (bool): Whether to select a random Pokémon sprite.
         list (bool): Whether to list all available Pokémon forms.
@@ -105,6 +56,8 @@ class Namespace:
     box_area: str | None = None
     transparency_color_hex: str | None = None
     large: bool = False
+    quantize: int | None = None
+    palette: bool = False
     name: str | None = None
     random: bool = False
     list: bool = False
@@ -112,6 +65,105 @@ class Namespace:
     show_name: bool = False
 
 
+def build_argparser() -> "ArgumentParser":
+    """
+    Build the command-line argument parser.
+
+    argparse is imported here, so invocations handled by `parse_args_fast` never import it.
+
+    Returns:
+        ArgumentParser: The pokesprite argument parser.
+
+    """
+    from argparse import ArgumentParser  # noqa: PLC0415
+
+    argparser = ArgumentParser(
+        prog="pokesprite",
+        description="Generate ANSI art from Pokémon sprites.",
+        usage="%(prog)s [options]",
+    )
+    _ = argparser.add_argument(
+        "--filename",
+        action="extend",
+        nargs="+",
+        type=str,
+        help="Image files to convert to ansi art (e.g. 'image.png').",
+        dest="filenames",
+    )
+    _ = argparser.add_argument(
+        "--style",
+        action="store",
+        default="blocks",
+        type=str,
+        choices=["blocks", "dots"],
+        help="art style to use: 'blocks' (default) or 'dots'.",
+    )
+    _ = argparser.add_argument(
+        "--box-area",
+        action="store",
+        type=str,
+        help=(
+            "Crop the image using the given left, upper, right, and lower pixel coordinates "
+            "(format: LxUxRxD)."
+        ),
+    )
+    _ = argparser.add_argument(
+        "--transparency-color-hex",
+        action="store",
+        type=str,
+        help="Set a specific RGB color as transparent in the image (format: AABBCC).",
+    )
+    _ = argparser.add_argument(
+        "--large",
+        action="store_true",
+        help="Display the image in large ANSI art (default is small, only valid for blocks style).",
+    )
+    _ = argparser.add_argument(
+        "--quantize",
+        action="store",
+        type=int,
+        help=(
+            "Reduce the image to the given number of colors before rendering "
+            "(e.g. 32, only valid with --filename)."
+        ),
+    )
+    _ = argparser.add_argument(
+        "--palette",
+        action="store_true",
+        help=(
+            "Use the 256 colors palette instead of truecolor, for terminals without truecolor support "
+            "(only valid with --filename)."
+        ),
+    )
+    _ = argparser.add_argument(
+        "--name",
+        action="store",
+        type=str,
+        help="Name of the Pokémon to display (e.g. 'ampharos' or 'ampharos-mega').",
+    )
+    _ = argparser.add_argument(
+        "--random",
+        action="store_true",
+        help="Display a random Pokémon.",
+    )
+    _ = argparser.add_argument(
+        "--list",
+        action="store_true",
+        help="List all available Pokémon forms.",
+    )
+    _ = argparser.add_argument(
+        "--shiny",
+        action="store_true",
+        help="Display the shiny version of the Pokémon (only valid with --name or --random).",
+    )
+    _ = argparser.add_argument(
+        "--show-name",
+        action="store_true",
+        help="Show the name of the random Pokémon.",
+    )
+    return argparser
+
+
 def main() -> None:
     """
     Entry point for the pokesprite CLI tool.
@@ -121,61 +173,113 @@ def main() -> None:
     are provided.
 
     Steps:
-        1. Parse arguments using argparser.
+        1. Parse arguments using the fast path, or argparser if it does not apply,
+           rejecting options that only apply to filenames when showing Pokémon sprites.
         2. If no filenames are provided, print help and exit.
-        3. For each filename:
-            a. Parse box area and transparency color from arguments.
-            b. If style is 'blocks', call show_blocks with relevant parameters.
-            c. If style is 'dots', call show_dots with relevant parameters.
+        3. Parse box area and transparency color from arguments, once for all filenames.
+        4. Render the files in a thread pool, with render_blocks or render_dots depending on the style.
+        5. Write the art of each file, in order.
     """
-    args = argparser.parse_args(namespace=Namespace())
+    argparser = None
+    args = parse_args_fast(sys.argv[1:])
+    if args is None:
+        argparser = build_argparser()
+        args = argparser.parse_args(namespace=Namespace())
+        check_filename_options_or_quit(argparser, args)
+    size = "large" if args.large else "small"
+    color = "shiny" if args.shiny else "regular"
     if args.name:
         show_pokemon_sprite(
             args.name,
             show_name=args.show_name,
             style=args.style,
-            size="large" if args.large else "small",
-            color="shiny" if args.shiny else "regular",
+            size=size,
+            color=color,
         )
         return
     if args.random:
         show_random_pokemon_sprite(
             show_name=args.show_name,
             style=args.style,
-            size="large" if args.large else "small",
-            color="shiny" if args.shiny else "regular",
+            size=size,
+            color=color,
         )
         return
     if args.list:
         show_pokemon_list()
         return
     if args.filenames:
-        for filename in map(Path, args.filenames):
-            box_area = parse_box_area_or_quit(args.box_area)
-            transparency_color = parse_color_hex_or_quit(args.transparency_color_hex)
-            if args.style == "blocks":
-                show_blocks(
-                    filename,
-                    box_area=box_area,
-                    transparency_color=transparency_color,
-                    large=args.large,
-                )
-            if args.style == "dots":
-                show_dots(
-                    filename,
-                    box_area=box_area,
-                    transparency_color=transparency_color,
-                )
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        box_area = parse_box_area_or_quit(args.box_area)
+        transparency_color = parse_color_hex_or_quit(args.transparency_color_hex)
+        if args.style == "blocks":
+            render = partial(
+                render_blocks,
+                box_area=box_area,
+                transparency_color=transparency_color,
+                large=args.large,
+                quantize=args.quantize,
+                palette=args.palette,
+            )
+        else:
+            render = partial(
+                render_dots,
+                box_area=box_area,
+                transparency_color=transparency_color,
+                quantize=args.quantize,
+                palette=args.palette,
+            )
+        # Pillow and NumPy release the GIL, so files are read and decoded concurrently,
+        # the art is written in the order of the filenames
+        with ThreadPoolExecutor(max_workers=min(8, len(args.filenames))) as executor:
+            for art in executor.map(render, map(Path, args.filenames)):
+                _ = sys.stdout.buffer.write(art)
         return
+    if argparser is None:
+        argparser = build_argparser()
     argparser.print_help()
     sys.exit(1)
 
 
+def parse_args_fast(argv: list[str]) -> Namespace | None:
+    """
+    Parse the arguments of the common Pokémon sprite invocations without argparse.
+
+    Only handles `--name NAME` and `--random`, combined with `--shiny`, `--large` and `--show-name`,
+    written exactly as these flags. Anything else is left to argparse, including help and errors.
+
+    Args:
+        argv (list[str]): The command-line arguments, without the program name.
+
+    Returns:
+        Namespace | None: The parsed arguments, or None if argparse must parse them.
+
+    """
+    args = Namespace()
+    tokens = iter(argv)
+    for arg in tokens:
+        if arg in FAST_PATH_FLAGS:
+            setattr(args, FAST_PATH_FLAGS[arg], True)
+        elif arg == "--name":
+            name = next(tokens, None)
+            if name is None or name.startswith("-"):
+                return None
+            args.name = name
+        else:
+            return None
+    if not args.name and not args.random:
+        return None
+    return args
+
+
 def show_blocks(
     path: Path,
-    box_area: Box | None = None,
-    transparency_color: Color | None = None,
+    box_area: "Box | None" = None,
+    transparency_color: "Color | None" = None,
     large: bool = False,  # noqa: FBT001, FBT002
+    quantize: int | None = None,
+    palette: bool = False,  # noqa: FBT001, FBT002
 ) -> None:
     """
     Display an image as ANSI art in the terminal.
@@ -188,28 +292,23 @@ def show_blocks(
             If True, displays the image in large ANSI art format.
             If False, uses small format.
             Defaults to False.
+        quantize (int | None, optional): Number of colors to reduce the image to. Defaults to None.
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor. Defaults to False.
 
     Returns:
         None
 
     """
-    with path.open(mode="rb") as f:
-        image_data = BytesIO(f.read())
-    image_array = get_image_array(
-        image_data,
-        box_area=box_area,
-        transparency_color=transparency_color,
-    )
-    if large:
-        print(array_to_blocks_art_large(image_array), end="")  # noqa: T201
-        return
-    print(array_to_blocks_art_small(image_array), end="")  # noqa: T201
+    art = render_blocks(path, box_area, transparency_color, large, quantize, palette)
+    _ = sys.stdout.buffer.write(art)
 
 
 def show_dots(
     path: Path,
-    box_area: Box | None = None,
-    transparency_color: Color | None = None,
+    box_area: "Box | None" = None,
+    transparency_color: "Color | None" = None,
+    quantize: int | None = None,
+    palette: bool = False,  # noqa: FBT001, FBT002
 ) -> None:
     """
     Display an image as dots art in the terminal.
@@ -218,23 +317,153 @@ def show_dots(
         path (Path): Path to the image file.
         box_area (Box | None): Optional area to crop the image.
         transparency_color (Color | None): Optional color to treat as transparent.
+        quantize (int | None): Optional number of colors to reduce the image to.
+        palette (bool): If True, use the 256 colors palette instead of truecolor.
 
     Returns:
         None
 
     """
-    with path.open(mode="rb") as f:
-        image_data = BytesIO(f.read())
-    image_array = get_image_array(
-        image_data,
+    art = render_dots(path, box_area, transparency_color, quantize, palette)
+    _ = sys.stdout.buffer.write(art)
+
+
+def render_blocks(
+    path: Path,
+    box_area: "Box | None" = None,
+    transparency_color: "Color | None" = None,
+    large: bool = False,  # noqa: FBT001, FBT002
+    quantize: int | None = None,
+    palette: bool = False,  # noqa: FBT001, FBT002
+) -> bytes:
+    """
+    Render an image as ANSI art, see `show_blocks`.
+
+    Args:
+        path (Path): Path to the image file.
+        box_area (Box | None, optional): Area of the image to display. Defaults to None.
+        transparency_color (Color | None, optional): Color to treat as transparent. Defaults to None.
+        large (bool, optional): If True, uses large ANSI art format instead of small. Defaults to False.
+        quantize (int | None, optional): Number of colors to reduce the image to. Defaults to None.
+        palette (bool, optional): If True, use the 256 colors palette instead of truecolor. Defaults to False.
+
+    Returns:
+        bytes: UTF-8 encoded ANSI art.
+
+    """
+    from pokesprite.ansi import array_to_blocks_art_large_bytes  # noqa: PLC0415
+    from pokesprite.ansi import array_to_blocks_art_small_bytes  # noqa: PLC0415
+
+    image_array = load_image_array(
+        path,
+        box_area=box_area,
+        transparency_color=transparency_color,
+        quantize=quantize,
+    )
+    if large:
+        return array_to_blocks_art_large_bytes(image_array, palette)
+    return array_to_blocks_art_small_bytes(image_array, palette)
+
+
+def render_dots(
+    path: Path,
+    box_area: "Box | None" = None,
+    transparency_color: "Color | None" = None,
+    quantize: int | None = None,
+    palette: bool = False,  # noqa: FBT001, FBT002
+) -> bytes:
+    """
+    Render an image as dots art, see `show_dots`.
+
+    Args:
+        path (Path): Path to the image file.
+        box_area (Box | None): Optional area to crop the image.
+        transparency_color (Color | None): Optional color to treat as transparent.
+        quantize (int | None): Optional number of colors to reduce the image to.
+        palette (bool): If True, use the 256 colors palette instead of truecolor.
+
+    Returns:
+        bytes: UTF-8 encoded dots art.
+
+    """
+    from pokesprite.dots import array_to_dots_art  # noqa: PLC0415
+
+    image_array = load_image_array(
+        path,
         resize_factor=2,
         box_area=box_area,
         transparency_color=transparency_color,
+        quantize=quantize,
     )
-    print(array_to_dots_art(image_array), end="")  # noqa: T201
+    return array_to_dots_art(image_array, palette=palette).encode()
+
+
+def load_image_array(
+    path: Path,
+    resize_factor: int | None = None,
+    box_area: "Box | None" = None,
+    transparency_color: "Color | None" = None,
+    quantize: int | None = None,
+) -> "ImageArray":
+    """
+    Load and process an image file, see `get_image_array`.
+
+    Results are memoized by path, modification time and options, so a file given
+    more than once is only read and processed once, unless it changed in between.
+    The returned array is shared and must not be modified in place.
+
+    Args:
+        path (Path): Path to the image file.
+        resize_factor (int | None): Optional factor to resize the image dimensions.
+        box_area (Box | None): Optional box area (left, upper, right, lower) to crop the image.
+        transparency_color (Color | None): Optional RGB color to set as transparent.
+        quantize (int | None): Optional number of colors to reduce the image to.
+
+    Returns:
+        ImageArray: The processed image as a NumPy array.
+
+    """
+    mtime_ns = path.stat().st_mtime_ns
+    return _load_image_array(str(path), mtime_ns, resize_factor, box_area, transparency_color, quantize)
+
+
+@lru_cache(maxsize=32)
+def _load_image_array(
+    filename: str,
+    mtime_ns: int,  # noqa: ARG001 # part of the cache key
+    resize_factor: int | None,
+    box_area: "Box | None",
+    transparency_color: "Color | None",
+    quantize: int | None,
+) -> "ImageArray":
+    """
+    Load and process an image file, memoized by `load_image_array`.
+
+    Args:
+        filename (str): Path to the image file.
+        mtime_ns (int): Modification time of the file, only used as part of the cache key.
+        resize_factor (int | None): Optional factor to resize the image dimensions.
+        box_area (Box | None): Optional box area (left, upper, right, lower) to crop the image.
+        transparency_color (Color | None): Optional RGB color to set as transparent.
+        quantize (int | None): Optional number of colors to reduce the image to.
+
+    Returns:
+        ImageArray: The processed image as a NumPy array.
+
+    """
+    from pokesprite.image import get_image_array  # noqa: PLC0415
+
+    with Path(filename).open(mode="rb") as f:
+        return get_image_array(
+            f,
+            resize_factor=resize_factor,
+            box_area=box_area,
+            transparency_color=transparency_color,
+            quantize=quantize,
+        )
 
 
-def parse_color_hex_or_quit(value: str | None) -> Color | None:
+def parse_color_hex_or_quit(value: str | None) -> "Color | None":
     """
     Parse a hex color string in the format 'AABBCC' and return its RGB components.
 
@@ -245,7 +474,7 @@ def parse_color_hex_or_quit(value: str | None) -> Color | None:
         Color | None: A tuple (r, g, b) if parsing succeeds, or None if value is None.
 
     Exits:
-        If the value is not 6 characters long, prints an error and exits the program.
+        If the value is not 6 hexadecimal digits, prints an error and exits the program.
 
     """
     if value is None:
@@ -253,13 +482,41 @@ def parse_color_hex_or_quit(value: str | None) -> Color | None:
     if len(value) != 6:  # noqa: PLR2004
         print("Color must be in format AABBCC")  # noqa: T201
         sys.exit(1)
-    r = int(value[0:2], base=16)
-    g = int(value[2:4], base=16)
-    b = int(value[4:6], base=16)
+    try:
+        r, g, b = bytes.fromhex(value)
+    except ValueError:
+        print("Color must be in format AABBCC")  # noqa: T201
+        sys.exit(1)
     return (r, g, b)
 
 
-def parse_box_area_or_quit(value: str | None) -> Box | None:
+def check_filename_options_or_quit(argparser: "ArgumentParser", args: Namespace) -> None:
+    """
+    Validate the options that only apply to filenames.
+
+    The Pokémon sprites are precomputed in truecolor, only files are rendered on the fly,
+    so these options are rejected when showing Pokémon sprites.
+
+    Args:
+        argparser (ArgumentParser): The parser used to report the error.
+        args (Namespace): The parsed arguments.
+
+    Exits:
+        If '--quantize' is not between 1 and 256, or if '--quantize' or '--palette' is combined
+        with '--name', '--random' or '--list', prints an error and exits the program.
+
+    """
+    if args.quantize is not None and not 1 <= args.quantize <= QUANTIZE_MAX_COLORS:
+        argparser.error(f"--quantize must be between 1 and {QUANTIZE_MAX_COLORS}")
+    if not (args.name or args.random or args.list):
+        return
+    if args.quantize is not None:
+        argparser.error("--quantize is only valid with --filename")
+    if args.palette:
+        argparser.error("--palette is only valid with --filename")
+
+
+def parse_box_area_or_quit(value: str | None) -> "Box | None":
     """
     Parse a area string in the format 'LxUxRxD' into a tuple of four integers.
 
@@ -275,8 +532,12 @@ def parse_box_area_or_quit(value: str | None) -> Box | None:
     """
     if value is None:
         return None
+    parts = value.split("x")
+    if len(parts) != 4:  # noqa: PLR2004
+        print("Area must be in format LxUxRxD")  # noqa: T201
+        sys.exit(1)
     try:
-        left, upper, right, lower = [int(v) for v in value.split("x")]
+        left, upper, right, lower = map(int, parts)
     except ValueError:
         print("Area must be in format LxUxRxD")  # noqa: T201
         sys.exit(1)
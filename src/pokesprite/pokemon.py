@@ -1,21 +1,22 @@
+import hashlib
 import importlib.resources
 import json
+import mmap
+import os
+import pickle
 import random
+import sys
 from collections.abc import Iterator
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import IO
 from typing import Any
 from typing import Literal
 from zipfile import Path as ZipPath
 from zipfile import ZipFile
 
-import requests
-
-from pokesprite.ansi import array_to_blocks_art_large
-from pokesprite.ansi import array_to_blocks_art_small
-from pokesprite.dots import array_to_dots_art
-from pokesprite.image import get_image_array
+# requests, multiprocessing and the image stack (numpy, PIL) are imported by the functions
+# that generate the sprites, so showing a precomputed Pokémon sprite does not pay for importing them
 
 
 def _mkdir(path: Path) -> Path:
@@ -37,13 +38,15 @@ POKEMON_SPRITE_REPO_URL = "https://github.com/msikma/pokesprite/archive/refs/hea
 POKEMON_MODULE_DATA_ROOT = _mkdir(Path(str(importlib.resources.files(__name__) / "data")))
 POKEMON_DATA_ROOT = _mkdir(Path("data"))
 POKEMON_SPRITES_REPO_ZIP_PATH = POKEMON_DATA_ROOT / "sprites.zip"
-POKEMON_SPRITES_PATH = POKEMON_DATA_ROOT / "sprites"
 POKEMON_DATABASE_PATH = POKEMON_MODULE_DATA_ROOT / "pokemon.json"
+POKEMON_FORMS_PATH = POKEMON_MODULE_DATA_ROOT / "pokemon.forms.pkl"
 POKEMON_TXT_PATH = POKEMON_MODULE_DATA_ROOT / "txt"
 POKEMON_TXT_SMALL_PATH = POKEMON_TXT_PATH / "small"
 POKEMON_TXT_LARGE_PATH = POKEMON_TXT_PATH / "large"
 POKEMON_TXT_DOTS_PATH = POKEMON_TXT_PATH / "dots"
 
+PokemonSpriteTask = tuple[bytes, str | None, str | None, str | None]
+
 
 def show_random_pokemon_sprite(
     show_name: bool = False,  # noqa: FBT001, FBT002
@@ -64,10 +67,7 @@ def show_random_pokemon_sprite(
         None
 
     """
-    with POKEMON_DATABASE_PATH.open(mode="r", encoding="utf-8") as f:
-        data = json.load(f)  # pyright: ignore[reportAny]
-    forms = [*_get_pokemon_forms(data)]  # pyright: ignore[reportAny]
-    form = random.choice(forms)  # noqa: S311
+    form = random.choice(_load_pokemon_forms())  # noqa: S311
     show_pokemon_sprite(form, show_name, style, size, color)
 
 
@@ -96,8 +96,8 @@ def show_pokemon_sprite(
 
     """
     prefix = size if style == "blocks" else "dots"
-    with (POKEMON_TXT_PATH / prefix / color / f"{form}.txt").open(mode="r", encoding="utf-8") as f:
-        print(f.read(), end="")  # noqa: T201
+    # the art is written as stored, without decoding and encoding it again
+    _ = sys.stdout.buffer.write((POKEMON_TXT_PATH / prefix / color / f"{form}.txt").read_bytes())
     if show_name:
         print(form)  # noqa: T201
 
@@ -106,16 +106,14 @@ def show_pokemon_list() -> None:
     """
     Print the list of all Pokémon forms available in the database.
 
-    Reads the Pokémon database file, extracts all forms, and prints each form to stdout.
+    Loads the Pokémon database, extracts all forms, and prints each form to stdout.
+    The forms are joined and written at once, instead of one write per form.
 
     Returns:
         None
 
     """
-    with POKEMON_DATABASE_PATH.open(mode="r", encoding="utf-8") as f:
-        data = json.load(f)  # pyright: ignore[reportAny]
-    for form in _get_pokemon_forms(data):  # pyright: ignore[reportAny]
-        print(form)  # noqa: T201
+    _ = sys.stdout.write("\n".join(_load_pokemon_forms()) + "\n")
 
 
 def generate_pokemon_sprite_ansi_files() -> None:
@@ -125,194 +123,317 @@ def generate_pokemon_sprite_ansi_files() -> None:
     Generates ANSI art files for each form and color variant, and saves them in the appropriate directories.
 
     Steps:
+    0. Returns early if every ANSI art file was already generated, without opening the archive.
     1. Opens the sprites ZIP archive.
     2. Loads all Pokémon forms from the JSON database.
     3. For each color variant ('regular', 'shiny'):
-        a. Creates output directories for PNG and TXT files.
-        b. Iterates over each form and generates ANSI art files from PNG sprites.
+        a. Creates output directories for TXT files.
+        b. Iterates over each form and reads the PNG sprites missing any ANSI art file.
+    4. Generates the ANSI art files from the PNG sprites as they are read, in parallel across processes.
 
     Returns:
         BytesIO: The repository data as a BytesIO object.
 
     """
-    with ZipFile(download_pokemon_sprite_repo_data(POKEMON_SPRITES_REPO_ZIP_PATH)) as zf:
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    # the forms sidecar is written before any sprite, so generation ran at least once if it exists
+    if POKEMON_FORMS_PATH.exists() and _has_pokemon_sprite_ansi_files(_load_pokemon_forms()):
+        return
+    with download_pokemon_sprite_repo_data(POKEMON_SPRITES_REPO_ZIP_PATH) as mm, ZipFile(mm) as zf:
         if zf.filename is None:
             zf.filename = "sprites.zip"  # zipfile.Path needs this to work properly
-        forms = [
-            *get_pokemon_forms(
-                ZipPath(zf, at="pokesprite-master/data/pokemon.json"),
-                POKEMON_DATABASE_PATH,
-            ),
-        ]
+        forms = get_pokemon_forms(
+            ZipPath(zf, at="pokesprite-master/data/pokemon.json"),
+            POKEMON_DATABASE_PATH,
+        )
+        # the forms list is what showing sprites needs, unpickling it is faster than parsing the database
+        _ = POKEMON_FORMS_PATH.write_bytes(pickle.dumps(tuple(forms), protocol=pickle.HIGHEST_PROTOCOL))
+        # the zip file is read sequentially, only decoding and rendering runs in parallel;
+        # tasks are submitted as they are read, so the workers start before the whole archive is read
+        with ProcessPoolExecutor() as executor:
+            tasks = _get_pokemon_sprite_tasks(zf, forms)
+            for _ in executor.map(_generate_pokemon_sprite_ansi_file_task, tasks, chunksize=16):
+                pass
+
+
+def _get_pokemon_sprite_tasks(zf: ZipFile, forms: list[str]) -> Iterator[PokemonSpriteTask]:
+    """
+    Yield the sprite generation tasks for the forms missing any ANSI art file.
+
+    Creates the output directories for TXT files of each color variant ('regular', 'shiny'),
+    and reads the PNG sprite of each form missing any ANSI art file.
+    Output paths of the ANSI art files that already exist are replaced by None.
+
+    Args:
+        zf (ZipFile): The sprites ZIP archive.
+        forms (list[str]): The name of each Pokémon form.
+
+    Yields:
+        PokemonSpriteTask: The image data and the output paths.
+
+    """
+    for color in ["regular", "shiny"]:
+        # plain member names are a single lookup in the archive, without joining ZipPath objects
+        zdirectory = f"pokesprite-master/pokemon-gen8/{color}"
+        txt_small_directory = _mkdir(POKEMON_TXT_SMALL_PATH / color)
+        txt_large_directory = _mkdir(POKEMON_TXT_LARGE_PATH / color)
+        txt_dots_directory = _mkdir(POKEMON_TXT_DOTS_PATH / color)
+        # one scan per directory instead of a stat per file
+        small_done = _list_filenames(txt_small_directory)
+        large_done = _list_filenames(txt_large_directory)
+        dots_done = _list_filenames(txt_dots_directory)
+        # output paths are joined as strings, a Path is only built when the file is written
+        txt_small_prefix = f"{txt_small_directory}{os.sep}"
+        txt_large_prefix = f"{txt_large_directory}{os.sep}"
+        txt_dots_prefix = f"{txt_dots_directory}{os.sep}"
+        for form in forms:
+            filename = f"{form}.txt"
+            if filename in small_done and filename in large_done and filename in dots_done:
+                continue
+            image_data = get_pokemon_sprite_data(zf, f"{zdirectory}/{form}.png")
+            yield (
+                image_data,
+                None if filename in small_done else txt_small_prefix + filename,
+                None if filename in large_done else txt_large_prefix + filename,
+                None if filename in dots_done else txt_dots_prefix + filename,
+            )
+
+
+def _has_pokemon_sprite_ansi_files(forms: tuple[str, ...]) -> bool:
+    """
+    Check if the ANSI art files of every form, size and color variant were already generated.
+
+    Args:
+        forms (tuple[str, ...]): The name of each Pokémon form.
+
+    Returns:
+        bool: True if no ANSI art file is missing.
+
+    """
+    filenames = {f"{form}.txt" for form in forms}
+    for txt_path in [POKEMON_TXT_SMALL_PATH, POKEMON_TXT_LARGE_PATH, POKEMON_TXT_DOTS_PATH]:
         for color in ["regular", "shiny"]:
-            zdirectory = ZipPath(zf, at="pokesprite-master/pokemon-gen8/") / color
-            directory = _mkdir(POKEMON_SPRITES_PATH / color)
-            txt_small_directory = _mkdir(POKEMON_TXT_SMALL_PATH / color)
-            txt_large_directory = _mkdir(POKEMON_TXT_LARGE_PATH / color)
-            txt_dots_directory = _mkdir(POKEMON_TXT_DOTS_PATH / color)
-            for form in forms:
-                generate_pokemon_sprite_ansi_file(
-                    zdirectory / f"{form}.png",
-                    directory / f"{form}.png",
-                    txt_small_directory / f"{form}.txt",
-                    txt_large_directory / f"{form}.txt",
-                    txt_dots_directory / f"{form}.txt",
-                )
-
-
-def download_pokemon_sprite_repo_data(path: Path) -> IO[bytes]:
+            directory = txt_path / color
+            if not directory.is_dir() or not filenames <= _list_filenames(directory):
+                return False
+    return True
+
+
+def _list_filenames(path: Path) -> set[str]:
+    """
+    List the names of the files in a directory.
+
+    Args:
+        path (Path): The directory path to scan.
+
+    Returns:
+        set[str]: The names of the files in the directory.
+
+    """
+    with os.scandir(path) as entries:
+        return {entry.name for entry in entries if entry.is_file()}
+
+
+def download_pokemon_sprite_repo_data(path: Path) -> mmap.mmap:
     """
     Download repository data from a remote URL or loads it from a cached file.
 
-    If the file at 'path' does not exist, it fetches the data from REPO_URL,
-    writes it to 'path' for caching, and returns the data as a BytesIO object.
-    If the file at 'path' exists, it reads the data directly from the cached file.
+    If the file at 'path' does not exist, it streams the data from REPO_URL
+    to 'path' for caching, without holding the whole archive in memory.
+    The data is written to a temporary file first, so an interrupted download is not cached.
+    Its SHA-256 digest is computed while streaming and saved next to 'path';
+    a cached file that no longer matches its digest is downloaded again.
+    The cached file is memory-mapped, so the archive is paged in on demand instead of copied.
 
     Args:
         path (Path): Path to the cached repository data file.
 
     Returns:
-        BytesIO: The repository data as a BytesIO object.
+        mmap.mmap: The cached repository data file, memory-mapped read-only.
 
     """
-    if not path.exists():
-        r = requests.request(method="GET", url=POKEMON_SPRITE_REPO_URL, timeout=10)
-        r.raise_for_status()
-        data = r.content
-        with path.open(mode="wb") as f:
-            _ = f.write(data)
-    else:
+    digest_path = path.with_name(f"{path.name}.sha256")
+    if path.exists() and digest_path.exists():
         with path.open(mode="rb") as f:
-            data = f.read()
-    return BytesIO(data)
-
-
-def get_pokemon_forms(zpath: ZipPath, path: Path) -> Iterator[str]:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        if digest != digest_path.read_text(encoding="utf-8").strip():
+            path.unlink()
+    if not path.exists():
+        import requests  # noqa: PLC0415
+
+        partial_path = path.with_name(f"{path.name}.part")
+        sha256 = hashlib.sha256()
+        with requests.request(method="GET", url=POKEMON_SPRITE_REPO_URL, timeout=10, stream=True) as r:
+            r.raise_for_status()
+            r.raw.decode_content = True
+            with partial_path.open(mode="wb") as f:
+                while chunk := r.raw.read(1 << 20):  # pyright: ignore[reportAny]
+                    sha256.update(chunk)  # pyright: ignore[reportAny]
+                    _ = f.write(chunk)  # pyright: ignore[reportAny]
+        _ = digest_path.write_text(sha256.hexdigest(), encoding="utf-8")
+        _ = partial_path.replace(path)
+    with path.open(mode="rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def get_pokemon_forms(zpath: ZipPath, path: Path) -> list[str]:
     """
-    Load Pokémon forms data from a zip file or a cached file and yields form names.
+    Load Pokémon forms data from a zip file or a cached file and return form names.
 
     If the file at 'path' does not exist, it reads the data from the zip file at 'zpath',
-    writes it to 'path' for caching, and loads the data.
+    copies it as is to 'path' for caching, and loads the data.
     If the file at 'path' exists, it loads the data directly from the cached file.
+    Either way, the data is parsed once.
 
     Args:
         zpath (ZipPath): Path to the JSON file inside the zip archive.
         path (Path): Path to the cached JSON file.
 
     Returns:
-        Iterator[str]: An iterator over Pokémon form names.
+        list[str]: The name of each Pokémon form.
 
     """
     if not path.exists():
-        with zpath.open(mode="r") as f:
-            data = json.load(f)  # pyright: ignore[reportAny]
-        with path.open(mode="w", encoding="utf-8") as f:
-            json.dump(data, f)
+        raw_data = zpath.read_bytes()
+        _ = path.write_bytes(raw_data)
     else:
-        with path.open(mode="r", encoding="utf-8") as f:
-            data = json.load(f)  # pyright: ignore[reportAny]
+        raw_data = path.read_bytes()
+    data = json.loads(raw_data)  # pyright: ignore[reportAny]
     return _get_pokemon_forms(data)  # pyright: ignore[reportAny]
 
 
-def _get_pokemon_forms(data: dict[str, Any]) -> Iterator[str]:  # pyright: ignore[reportExplicitAny]
+@lru_cache(maxsize=1)
+def _load_pokemon_database() -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+    """
+    Load the Pokémon database, parsed once per process.
+
+    Returns:
+        dict[str, Any]: Dictionary containing Pokémon data.
+
+    """
+    with POKEMON_DATABASE_PATH.open(mode="r", encoding="utf-8") as f:
+        return json.load(f)  # pyright: ignore[reportAny]
+
+
+@lru_cache(maxsize=1)
+def _load_pokemon_forms() -> tuple[str, ...]:
+    """
+    Load all Pokémon form names, computed once per process.
+
+    Forms are loaded from the pickled forms list written during sprite generation,
+    falling back to the Pokémon database if it is missing.
+
+    Returns:
+        tuple[str, ...]: The name of each Pokémon form.
+
+    """
+    if POKEMON_FORMS_PATH.exists():
+        return pickle.loads(POKEMON_FORMS_PATH.read_bytes())  # noqa: S301 # pyright: ignore[reportAny]
+    return tuple(_get_pokemon_forms(_load_pokemon_database()))
+
+
+def _get_pokemon_forms(data: dict[str, Any]) -> list[str]:  # pyright: ignore[reportExplicitAny]
     """
-    Yield all Pokémon form names from the provided data.
+    Collect all Pokémon form names from the provided data.
 
     Iterates through each Pokémon entry in the data, and for each form in "gen-8",
-    yields the form name. If the form is an alias, it is skipped.
-    If the form name is "$", yields the Pokémon's English slug.
-    Otherwise, yields the slug combined with the form name.
+    collects the form name. If the form is an alias, it is skipped.
+    If the form name is "$", collects the Pokémon's English slug.
+    Otherwise, collects the slug combined with the form name.
 
     Args:
         data (dict[str, Any]): Dictionary containing Pokémon data.
 
-    Yields:
-        str: The name of each Pokémon form.
+    Returns:
+        list[str]: The name of each Pokémon form.
 
     """
+    forms: list[str] = []
     for pokemon in data.values():  # pyright: ignore[reportAny]
+        slug: str = pokemon["slug"]["eng"]  # pyright: ignore[reportAny]
         for form_name, form_info in pokemon["gen-8"]["forms"].items():  # pyright: ignore[reportAny]
             if "is_alias_of" in form_info:
                 continue
-            if form_name == "$":
-                yield pokemon["slug"]["eng"]
-            else:
-                yield f"{pokemon['slug']['eng']}-{form_name}"
+            forms.append(slug if form_name == "$" else f"{slug}-{form_name}")
+    return forms
 
 
-def get_pokemon_sprite_data(zpath: ZipPath, path: Path) -> IO[bytes]:
+def get_pokemon_sprite_data(zf: ZipFile, name: str) -> bytes:
     """
-    Retrieve sprite image data from a zip file or a cached file.
+    Retrieve sprite image data from a zip file.
 
-    If the file at 'path' does not exist, it reads the image data from the zip file at 'zpath',
-    writes it to 'path' for caching, and returns the data as a BytesIO object.
-    If the file at 'path' exists, it reads the image data directly from the cached file
-    and returns it as a BytesIO object.
+    The image data is read from the member 'name' of the zip file, which is memory-mapped,
+    so it is not cached to disk: it is only decoded once, during generation.
+    The raw bytes are returned as is, since they are sent to a worker process
+    that wraps them for the image decoder.
 
     Args:
-        zpath (ZipPath): Path to the image inside the zip archive.
-        path (Path): Path to the cached image file.
+        zf (ZipFile): The sprites ZIP archive.
+        name (str): Name of the image inside the zip archive.
 
     Returns:
-        BytesIO: The image data as a BytesIO object.
+        bytes: The image data.
 
     """
-    if not path.exists():
-        with zpath.open(mode="rb") as f:
-            img_data = f.read()
-        with path.open(mode="wb") as f:
-            _ = f.write(img_data)
-    else:
-        # NOTE:
-        # this is cached, so we don't read from the zip file again.
-        # we can get rid we dont care about caching.
-        with path.open(mode="rb") as f:
-            img_data = f.read()
-    return BytesIO(img_data)
+    return zf.read(name)
 
 
 def generate_pokemon_sprite_ansi_file(
-    zipped_filename: ZipPath,
-    sprite_filename: Path,
-    txt_filename_small: Path,
-    txt_filename_large: Path,
-    txt_filename_dots: Path,
+    image_data: bytes,
+    txt_filename_small: str | Path | None,
+    txt_filename_large: str | Path | None,
+    txt_filename_dots: str | Path | None,
 ) -> None:
     """
-    Generate ANSI art files (small, large and dots) from a sprite image inside a zip archive.
+    Generate ANSI art files (small, large and dots) from a sprite image.
 
-    Checks if the output text files already exist; if not, extracts the sprite image,
-    converts it to ANSI art in three formats (small, large and dots), and writes the results
-    to the specified text files.
+    Converts the sprite image to ANSI art in three formats (small, large and dots),
+    and writes the results to the specified text files. Formats without an output path
+    are skipped; the caller decides which files already exist, so no file is checked here.
 
     Args:
-        zipped_filename (ZipPath): Path inside the zip archive containing the sprite.
-        sprite_filename (Path): Path to the extracted sprite image.
-        txt_filename_small (Path): Output path for the small ANSI art text file.
-        txt_filename_large (Path): Output path for the large ANSI art text file.
-        txt_filename_dots (Path): Output path for the dots ANSI art text file.
+        image_data (bytes): The sprite image data.
+        txt_filename_small (str | Path | None): Output path for the small ANSI art text file.
+        txt_filename_large (str | Path | None): Output path for the large ANSI art text file.
+        txt_filename_dots (str | Path | None): Output path for the dots ANSI art text file.
 
     Returns:
         None
 
     """
-    txt_small_exists = txt_filename_small.exists()
-    txt_large_exists = txt_filename_large.exists()
-    txt_dots_exists = txt_filename_dots.exists()
-    if txt_small_exists and txt_large_exists and txt_dots_exists:
-        return
-    image_data = get_pokemon_sprite_data(zipped_filename, sprite_filename)
-    image_array = get_image_array(image_data)
-    if not txt_small_exists:
-        txt_small = array_to_blocks_art_small(image_array)
-        with txt_filename_small.open(mode="w", encoding="utf-8") as f:
-            _ = f.write(txt_small)
-    if not txt_large_exists:
-        txt_large = array_to_blocks_art_large(image_array)
-        with txt_filename_large.open(mode="w", encoding="utf-8") as f:
-            _ = f.write(txt_large)
-    if not txt_dots_exists:
-        image_array = get_image_array(image_data, resize_factor=2)
+    from pokesprite.ansi import array_to_blocks_art_large  # noqa: PLC0415
+    from pokesprite.ansi import array_to_blocks_art_small  # noqa: PLC0415
+    from pokesprite.dots import array_to_dots_art  # noqa: PLC0415
+    from pokesprite.image import get_image_array  # noqa: PLC0415
+
+    if txt_filename_small is not None or txt_filename_large is not None:
+        image_array = get_image_array(BytesIO(image_data))
+        if txt_filename_small is not None:
+            txt_small = array_to_blocks_art_small(image_array)
+            _ = Path(txt_filename_small).write_text(txt_small, encoding="utf-8")
+        if txt_filename_large is not None:
+            txt_large = array_to_blocks_art_large(image_array)
+            _ = Path(txt_filename_large).write_text(txt_large, encoding="utf-8")
+    if txt_filename_dots is not None:
+        image_array = get_image_array(BytesIO(image_data), resize_factor=2)
         txt_dots = array_to_dots_art(image_array)
-        with txt_filename_dots.open(mode="w", encoding="utf-8") as f:
-            _ = f.write(txt_dots)
+        _ = Path(txt_filename_dots).write_text(txt_dots, encoding="utf-8")
+
+
+def _generate_pokemon_sprite_ansi_file_task(task: PokemonSpriteTask) -> None:
+    """
+    Unpack the arguments of `generate_pokemon_sprite_ansi_file`, for use with `Executor.map`.
+
+    Args:
+        task (PokemonSpriteTask): The image data and the output paths.
+
+    Returns:
+        None
+
+    """
+    generate_pokemon_sprite_ansi_file(*task)
+
+
+if __name__ == "__main__":
+    generate_pokemon_sprite_ansi_files()
@@ -0,0 +1,41 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pokesprite.image import get_image_array
+from pokesprite.image import load_image
+from pokesprite.image import visible_mask
+
+
+def make_sprite_png() -> bytes:
+    """
+    Build a sprite-like RGBA image with many colors and a transparent border.
+
+    Returns:
+        bytes: The image encoded as PNG.
+
+    """
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    alpha = np.where(rng.random((32, 32)) > 0.3, 255, 0).astype(np.uint8)  # noqa: PLR2004
+    alpha[:4] = 0
+    alpha[:, :4] = 0
+    buf = BytesIO()
+    Image.fromarray(np.dstack([rgb, alpha]), "RGBA").save(buf, "PNG")
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("colors", [1, 8, 256])
+def test_quantize_keeps_visible_pixels(colors: int) -> None:
+    data = make_sprite_png()
+    original = np.asarray(load_image(BytesIO(data)))
+    quantized = np.asarray(load_image(BytesIO(data), quantize=colors))
+    assert (visible_mask(quantized) == visible_mask(original)).all()
+    assert len(np.unique(quantized[:, :, :3].reshape(-1, 3), axis=0)) <= colors
+
+
+def test_quantize_keeps_trimmed_shape() -> None:
+    data = make_sprite_png()
+    assert get_image_array(BytesIO(data), quantize=1).shape == get_image_array(BytesIO(data)).shape
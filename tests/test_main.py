@@ -0,0 +1,18 @@
+import sys
+
+import pytest
+
+from pokesprite.main import main
+
+
+@pytest.mark.parametrize("colors", ["0", "-1", "257", "500"])
+def test_quantize_out_of_range_is_rejected(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    colors: str,
+) -> None:
+    monkeypatch.setattr(sys, "argv", ["pokesprite", "--filename", "image.png", "--quantize", colors])
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+    assert excinfo.value.code == 2  # noqa: PLR2004
+    assert "--quantize must be between 1 and 256" in capsys.readouterr().err